@@ -6,15 +6,25 @@ from pyppeteer import launch
 from pyppeteer.errors import NetworkError, PageError
 import websockets.exceptions
 import logging
+import metrics
 from fake_useragent import UserAgent
 from bs4 import BeautifulSoup
 import random
+from articlelinks import collect_articles
+from checkpoint import atomic_write_text
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+metrics.setup('news')
 
-# Initialize the UserAgent object for user-agent rotation
-fake_user_agent = UserAgent()
+# UserAgent object for user-agent rotation, created on first use since it loads its browser data
+fake_user_agent = None
+
+def get_fake_user_agent():
+    global fake_user_agent
+    if fake_user_agent is None:
+        fake_user_agent = UserAgent()
+    return fake_user_agent
 
 # Directory for saving articles
 output_directory = "Saved_Articles"
@@ -31,75 +41,83 @@ def load_processed_urls():
 
 # Save processed URLs to the file
 def save_processed_urls(urls):
-    with open('processed_urls.txt', 'w') as file:
-        for url in urls:
-            file.write(url + '\n')
+    atomic_write_text('processed_urls.txt', ''.join(url + '\n' for url in urls))
 
-processed_urls = load_processed_urls()
+# Populated from processed_urls.txt when main() starts; a link is added once its article is saved
+processed_urls = set()
+# Links being scraped right now, so the same link isn't fetched twice at once
+in_progress_urls = set()
 
 async def goto_with_retry(page, url, max_retries=5):
     retry_delay = 1  # Initial delay
     for attempt in range(max_retries):
         try:
-            await page.goto(url, {'waitUntil': 'networkidle2'})
+            with metrics.timer('navigate'):
+                await page.goto(url, {'waitUntil': 'networkidle2'})
             return
         except Exception as e:
+            metrics.retry('navigate')
             logging.warning(f"Retry {attempt + 1} for {url}: {e}")
             await asyncio.sleep(retry_delay)
             retry_delay *= 2  # Exponential backoff
     raise Exception(f"Failed to load {url} after {max_retries} retries")
 
 async def scrape_and_save_article(browser, link, idx, search_query):
-    if link in processed_urls:
+    if link in processed_urls or link in in_progress_urls:
         logging.info(f"Skipping already processed article: {link}")
         return
-    else:
-        processed_urls.add(link)
-
-    page = await browser.newPage()
-    await page.setUserAgent(fake_user_agent.random)
-    await page.setViewport({
-        'width': random.randint(1024, 1920),
-        'height': random.randint(768, 1080),
-        'deviceScaleFactor': random.randint(1, 3)
-    })
-
-    # Additional headers can be customized here
-    await page.setExtraHTTPHeaders({
-        'Accept-Language': 'en-US',
-        'Referer': 'https://www.google.com/'
-    })
+    in_progress_urls.add(link)
 
+    page = None
     try:
+        page = await browser.newPage()
+        await page.setUserAgent(get_fake_user_agent().random)
+        await page.setViewport({
+            'width': random.randint(1024, 1920),
+            'height': random.randint(768, 1080),
+            'deviceScaleFactor': random.randint(1, 3)
+        })
+
+        # Additional headers can be customized here
+        await page.setExtraHTTPHeaders({
+            'Accept-Language': 'en-US',
+            'Referer': 'https://www.google.com/'
+        })
+
         await asyncio.sleep(random.uniform(2, 5))  # Random delay
         await goto_with_retry(page, link)
 
         content = await page.content()
-        soup = BeautifulSoup(content, 'lxml')
-        title_element = soup.find('h1')
+        with metrics.timer('parse'):
+            soup = BeautifulSoup(content, 'lxml')
+            title_element = soup.find('h1')
         title = title_element.get_text(strip=True) if title_element else "UnknownTitle"
         valid_title = ''.join(c for c in title if c.isalnum() or c.isspace())
 
         filename = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{idx+1}_{valid_title}.html"
         filepath = os.path.join(output_directory, filename.replace(" ", "_"))
-        with open(filepath, "w", encoding="utf-8") as file:
+        with metrics.timer('write'), open(filepath, "w", encoding="utf-8") as file:
             file.write(f'<a href="{link}" target="_blank">Source URL</a>\n\n{content}')
+        metrics.add_bytes('write', len(content))
+        processed_urls.add(link)
 
         logging.info(f"Article {idx + 1} saved: {filepath}")
     except (NetworkError, PageError, websockets.exceptions.ConnectionClosedError) as e:
         logging.error(f"Error scraping article {idx + 1}: {e}")
     finally:
+        in_progress_urls.discard(link)
         if page and not page.isClosed():
             await page.close()
 
 async def get_article_links(browser, query, max_articles=10):
     page = await browser.newPage()
-    await page.setUserAgent(fake_user_agent.random)
-    await page.goto(f"https://news.google.com/search?q={urllib.parse.quote_plus(query)}", {'waitUntil': 'networkidle2'})
+    await page.setUserAgent(get_fake_user_agent().random)
+    with metrics.timer('navigate'):
+        await page.goto(f"https://news.google.com/search?q={urllib.parse.quote_plus(query)}", {'waitUntil': 'networkidle2'})
     await page.waitForSelector('article')
 
-    elements = await page.querySelectorAll('article')
-    links = await asyncio.gather(*(page.evaluate('(element) => element.querySelector("a").href', el) for el in elements))
+    articles = await collect_articles(page, max_articles)
+    links = [article['href'] for article in articles if article['href']]
 
     await page.close()
     return links[:max_articles]
@@ -112,8 +130,11 @@ async def scrape_articles(query, max_articles=10):
         await asyncio.gather(*tasks)
     finally:
         await browser.close()
+        # Persist after every query so an interrupted session doesn't refetch finished articles
+        save_processed_urls(processed_urls)
 
 async def main():
+    processed_urls.update(load_processed_urls())
     while True:
         query = input("Enter search query ('exit' to quit): ").strip()
         if query.lower() == 'exit':
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import metrics
+
+# Scrolls to the bottom of the results and reports how many linked articles are loaded,
+# so each pagination step costs a single round-trip.
+SCROLL_SCRIPT = '''() => {
+    window.scrollTo(0, document.body.scrollHeight);
+    return Array.from(document.querySelectorAll('article')).filter(article => article.querySelector('a[href]')).length;
+}'''
+
+# Extracts every article in one pass and returns a plain array the DevTools
+# protocol can serialise back in a single message.
+EXTRACT_SCRIPT = '''(maxItems) => {
+    // Drop link-less articles before slicing so maxItems counts usable results
+    const articles = Array.from(document.querySelectorAll('article')).filter(article => article.querySelector('a[href]'));
+    return articles.slice(0, maxItems || articles.length).map(article => {
+        const link = article.querySelector('a[href]');
+        const time = article.querySelector('time');
+        // Google News renders the publisher name in a data-n-tid element
+        const source = article.querySelector('[data-n-tid]');
+        return {
+            text: article.innerText,
+            href: link.href,
+            source: source ? source.innerText.trim() : null,
+            timestamp: time ? (time.getAttribute('datetime') || time.innerText) : null
+        };
+    });
+}'''
+
+
+async def collect_articles(page, max_articles=None, max_scrolls=10, scroll_delay=1.5, evaluates_per_article=1):
+    """
+    Collects text, href, source and timestamp for the articles on a loaded results page.
+    Scrolls until max_articles are loaded or the page stops growing, then extracts
+    everything with a single evaluate call.
+    """
+    round_trips = 0
+    count = 0
+    for _ in range(max_scrolls):
+        new_count = await page.evaluate(SCROLL_SCRIPT)
+        round_trips += 1
+        if max_articles and new_count >= max_articles:
+            break
+        if new_count == count:
+            break
+        count = new_count
+        await asyncio.sleep(scroll_delay)
+
+    articles = await page.evaluate(EXTRACT_SCRIPT, max_articles or 0)
+    round_trips += 1
+    metrics.count('round_trips_total', 'collect', round_trips)
+
+    logging.info(f"Collected {len(articles)} articles in {round_trips} evaluate round-trips "
+                 f"(per-element evaluation would take {len(articles) * evaluates_per_article})")
+    return articles
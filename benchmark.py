@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Offline benchmarks for the KEV, GitHub report and OCR pipelines. A local
+# stand-in server replaces the CISA catalog and the GitHub REST/GraphQL APIs,
+# so runs are repeatable and don't touch the network.
+
+repo_directory = os.path.dirname(os.path.abspath(__file__))
+baseline_path = os.path.join(repo_directory, "benchmark_baseline.json")
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_TOLERANCE = 0.25   # Allowed slowdown / memory growth over the baseline
+MIN_SECONDS_SLACK = 0.005  # Ignore regressions smaller than this, they're timer noise
+MIN_BYTES_SLACK = 64 * 1024
+CALIBRATION_RUNS = 3       # Calibration samples taken right before each timed run
+KEV_PAGE_SIZE = 25
+OCR_LINES_PER_IMAGE = 25
+OCR_KEYWORDS = ['exploit', 'ransomware', 'phishing']
+
+WORDS = ("attacker remote code execution vulnerability patch vendor advisory server client "
+         "network privilege escalation malware campaign credential kernel browser update").split()
+
+
+# Fixtures
+
+def kev_page(page, total):
+    start = (page - 1) * KEV_PAGE_SIZE
+    rows = []
+    for idx in range(start, min(start + KEV_PAGE_SIZE, total)):
+        rows.append(
+            f'<div class="c-view__row"><article class="c-teaser"><div class="c-teaser__row">'
+            f'<h3 class="c-teaser__title"><a href="/vuln/{idx}">CVE-2023-{idx:05d}</a></h3>'
+            f'<div class="c-teaser__vuln-name">Vendor{idx % 97} Product{idx % 13} Remote Code Execution Vulnerability</div>'
+            f'<div class="c-teaser__summary">Vendor{idx % 97} Product{idx % 13} contains an unspecified vulnerability '
+            f'that allows a remote attacker to execute code. Apply updates per vendor instructions.</div>'
+            f'</div></article></div>'
+        )
+    return (f'<html><head><title>Known Exploited Vulnerabilities Catalog</title></head><body>'
+            f'<main><div class="view-content">{"".join(rows)}</div></main></body></html>').encode('utf-8')
+
+
+def github_search_response(base_url, total):
+    items = [{
+        'login': f'user{idx}',
+        'id': idx,
+        'html_url': f'https://github.com/user{idx}',
+        'avatar_url': f'{base_url}/avatars/{idx}.png',
+        'type': 'User',
+    } for idx in range(total)]
+    return json.dumps({'total_count': total, 'incomplete_results': False, 'items': items}).encode('utf-8')
+
+
+def graphql_response(variables):
+    data = {}
+    for name, login in variables.items():
+        idx = int(login[len('user'):])
+        data[f"u{name[1:]}"] = {
+            'login': login,
+            'bio': f"Security researcher #{idx}",
+            'company': f"Company{idx % 50}",
+            'location': f"City{idx % 30}",
+            'followers': {'totalCount': idx % 1000},
+            'repositories': {'totalCount': idx % 200},
+        }
+    return json.dumps({'data': data}).encode('utf-8')
+
+
+_avatar_cache = {}
+
+
+def avatar_png(idx):
+    # 64 distinct colours is plenty; rendering one image per user would dominate setup
+    from PIL import Image
+    key = idx % 64
+    if key not in _avatar_cache:
+        buffer = io.BytesIO()
+        Image.new('RGB', (50, 50), ((key * 37) % 256, (key * 91) % 256, (key * 53) % 256)).save(buffer, 'PNG')
+        _avatar_cache[key] = buffer.getvalue()
+    return _avatar_cache[key]
+
+
+def text_corpus(size):
+    rng = random.Random(size)
+    lines = []
+    for _ in range(size):
+        words = rng.sample(WORDS, 6)
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), rng.choice(OCR_KEYWORDS))
+        lines.append(' '.join(words).capitalize() + '.')
+    return lines
+
+
+def render_corpus(lines, directory):
+    from PIL import Image, ImageDraw
+    paths = []
+    for start in range(0, len(lines), OCR_LINES_PER_IMAGE):
+        chunk = lines[start:start + OCR_LINES_PER_IMAGE]
+        img = Image.new('L', (1200, 30 * len(chunk) + 40), 255)
+        draw = ImageDraw.Draw(img)
+        for row, line in enumerate(chunk):
+            draw.text((20, 20 + row * 30), line, fill=0)
+        path = os.path.join(directory, f"ocr_{len(lines)}_{start // OCR_LINES_PER_IMAGE}.png")
+        img.save(path)
+        paths.append(path)
+    return paths
+
+
+# Stand-in server
+
+class StandInServer:
+    """
+    Serves synthetic KEV catalog pages, GitHub search/GraphQL responses and avatar images.
+    """
+
+    def __init__(self):
+        self.kev_items = 0
+        self.github_items = 0
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, so the client's connection pool is exercised
+            disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+            def log_message(self, *args):
+                pass
+
+            def send_body(self, body, content_type):
+                server.requests += 1
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/kev':
+                    page = int(parse_qs(url.query).get('page', ['1'])[0])
+                    self.send_body(kev_page(page, server.kev_items), 'text/html; charset=utf-8')
+                elif url.path == '/github/search/users':
+                    self.send_body(github_search_response(server.base_url, server.github_items), 'application/json')
+                elif url.path.startswith('/avatars/'):
+                    self.send_body(avatar_png(int(url.path.rsplit('/', 1)[1].split('.')[0])), 'image/png')
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if urlparse(self.path).path == '/github/graphql':
+                    self.send_body(graphql_response(json.loads(body)['variables']), 'application/json')
+                else:
+                    self.send_error(404)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name="stand-in-server", daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+# Pipelines: each returns (stage name, prepare, run) tuples for one data size
+
+def kev_stages(server, size, workdir):
+    import yeetumis
+    yeetumis.KEV_CATALOG_URL = f"{server.base_url}/kev"
+
+    def prepare_scrape():
+        server.kev_items = size
+        yeetumis.page = 1
+        yeetumis.cves.clear()
+        yeetumis.checkpoint.clear()
+        # Periodic saves are wall-clock driven, so they'd land on a different page (and list size)
+        # every run and make the peak memory jump between runs; time the scrape itself
+        yeetumis.checkpoint.interval = float('inf')
+
+    def scrape():
+        yeetumis.scrape_cisa_for_cves(2023, [])
+        if len(yeetumis.cves) != size:
+            raise RuntimeError(f"KEV scrape returned {len(yeetumis.cves)} CVEs, expected {size}")
+
+    return [
+        ('kev.scrape', prepare_scrape, scrape),
+        ('kev.csv', None, yeetumis.write_data_to_csv),
+    ]
+
+
+def github_stages(server, size, workdir):
+    import githubbot
+    githubbot.GITHUB_API_URL = f"{server.base_url}/github"
+    githubbot.GRAPHQL_URL = f"{githubbot.GITHUB_API_URL}/graphql"
+    results = {}
+
+    def prepare_search():
+        server.github_items = size
+
+    def search():
+        results['search'] = githubbot.fetch_from_github_api('benchmark', api_key='benchmark')
+
+    def prepare_pdf():
+        # Start cold so every run pays for the GraphQL enrichment
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(githubbot.PROFILE_CACHE_FILE)
+
+    def pdf():
+        githubbot.create_pdf(results['search'], os.path.join(workdir, f"github_{size}.pdf"), api_key='benchmark')
+
+    return [
+        ('github.search', prepare_search, search),
+        ('github.pdf', prepare_pdf, pdf),
+    ]
+
+
+def ocr_stages(server, size, workdir):
+    import wordsearchocr
+    lines = text_corpus(size)
+    stages = []
+    if shutil.which('tesseract'):
+        images = render_corpus(lines, workdir)
+        texts = []
+
+        def ocr():
+            texts[:] = [wordsearchocr.extract_text_from_image(path) for path in images]
+
+        stages.append(('ocr.extract', None, ocr))
+    else:
+        logging.warning("tesseract not found, skipping ocr.extract; ocr.search runs on the corpus text")
+
+    text = '\n'.join(lines)
+    stages.append(('ocr.search', None, lambda: wordsearchocr.search_keywords_in_text(text, OCR_KEYWORDS)))
+    return stages
+
+
+PIPELINES = {
+    'kev': kev_stages,
+    'github': github_stages,
+    'ocr': ocr_stages,
+}
+
+
+# Measurement
+
+def run_quietly(fn):
+    # The scripts print per-item progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def substage_timings():
+    # Concurrent fetches overlap, so report count and median rather than a sum
+    import metrics
+    return {stage: {'count': len(values), 'p50': metrics.quantile(values, 0.5)}
+            for (name, stage), values in metrics.observations.items() if name == 'stage_seconds'}
+
+
+def calibration_workload():
+    # Fixed mix of JSON, string and sorting work, like the parsing the pipelines spend their CPU on
+    rng = random.Random(0)
+    rows = [{'id': f"CVE-2023-{idx:05d}", 'words': rng.sample(WORDS, 6)} for idx in range(2000)]
+    text = json.dumps(rows)
+    for row in json.loads(text):
+        ' '.join(row['words']).lower().split()
+    sorted(text.split(','))
+
+
+def calibrate():
+    """
+    Returns the best time for calibration_workload(). Stage timings are compared to
+    the baseline as multiples of it, so a baseline recorded on one machine holds on
+    a faster or slower one.
+    """
+    best = None
+    # Like timeit, keep collections of earlier stages' garbage out of the sample
+    gc.disable()
+    try:
+        for _ in range(CALIBRATION_RUNS):
+            start = time.perf_counter()
+            calibration_workload()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def measure(prepare, run, repeat):
+    """
+    Returns the best wall time over repeat runs, the per-stage metrics of that run,
+    that time as a multiple of the best calibration taken between the runs, and
+    peak traced memory from one extra run under tracemalloc.
+    """
+    import metrics
+    best, best_substages, calibration = None, {}, None
+    for _ in range(repeat):
+        # Calibrating alongside the runs keeps both measured under the same machine load
+        sample = calibrate()
+        calibration = sample if calibration is None else min(calibration, sample)
+        if prepare:
+            prepare()
+        metrics.observations.clear()
+        gc.collect()
+        start = time.perf_counter()
+        run_quietly(run)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best, best_substages = elapsed, substage_timings()
+
+    # Memory is measured separately since tracing slows the run down
+    if prepare:
+        prepare()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_quietly(run)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': best, 'relative': best / calibration, 'calibration': calibration,
+            'peak_bytes': peak, 'substages': best_substages}
+
+
+def stage_key(key):
+    # 'kev.scrape.1000' -> ('kev', 1000)
+    return key.split('.', 1)[0], int(key.rsplit('.', 1)[1])
+
+
+def compare(results, baseline, tolerance, pipelines, sizes):
+    """
+    Returns a failure for every stage that regressed, was measured but has no
+    baseline entry, or has a baseline entry but wasn't measured in this run.
+    """
+    failures = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            failures.append(f"{key}: no baseline entry; record one with --update-baseline")
+            continue
+        slack = MIN_SECONDS_SLACK / result['calibration']
+        if result['relative'] > base['relative'] * (1 + tolerance) + slack:
+            failures.append(f"{key}: {result['relative']:.2f}x calibration vs baseline {base['relative']:.2f}x")
+        if result['peak_bytes'] > base['peak_bytes'] * (1 + tolerance) + MIN_BYTES_SLACK:
+            failures.append(f"{key}: peak {result['peak_bytes'] / 1e6:.1f} MB vs baseline {base['peak_bytes'] / 1e6:.1f} MB")
+    for key in sorted(baseline):
+        pipeline, size = stage_key(key)
+        if pipeline in pipelines and size in sizes and key not in results:
+            failures.append(f"{key}: in the baseline but not measured")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the KEV, GitHub and OCR pipelines.")
+    parser.add_argument("--sizes", default=','.join(map(str, DEFAULT_SIZES)), help="Comma-separated item counts (default: 100,1000,10000)")
+    parser.add_argument("--only", default=','.join(PIPELINES), help="Comma-separated pipelines to run (kev, github, ocr)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the fastest is reported (the committed baseline uses 3)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression over the baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=baseline_path, help="Baseline JSON file to compare against (default: the committed benchmark_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--workdir", help="Directory for generated files (default: a new temporary directory)")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    # Configure logging before the scripts do, so their per-item logs stay quiet
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    pipelines = [name.strip() for name in args.only.split(',')]
+    baseline_file = os.path.abspath(args.baseline)
+    output_file = os.path.abspath(args.output) if args.output else None
+    # Without a baseline there is nothing to check against, so don't report success
+    if not args.update_baseline and not os.path.exists(baseline_file):
+        print(f"No baseline at {baseline_file}; run with --update-baseline to create one.")
+        sys.exit(1)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="tools-bench-"))
+    os.makedirs(workdir, exist_ok=True)
+    # The scripts write logs, caches and reports to the current directory
+    os.chdir(workdir)
+    sys.path.insert(0, repo_directory)
+
+    import metrics
+    metrics.setup('benchmark', os.path.join(workdir, 'metrics.json'))
+
+    server = StandInServer()
+    server.start()
+    results = {}
+    try:
+        print(f"{'stage':<28} {'seconds':>10} {'relative':>9} {'peak MB':>9}  substages (count x median)")
+        for name in pipelines:
+            for size in sizes:
+                try:
+                    stages = PIPELINES[name](server, size, workdir)
+                except ImportError as e:
+                    logging.warning(f"Skipping {name}: {e}")
+                    break
+                if size == sizes[0]:
+                    # Untimed pass so one-off costs (imports, font loading, the HTTP loop) don't land on the first size
+                    for stage, prepare, run in stages:
+                        if prepare:
+                            prepare()
+                        run_quietly(run)
+                for stage, prepare, run in stages:
+                    key = f"{stage}.{size}"
+                    results[key] = measure(prepare, run, args.repeat)
+                    substages = ', '.join(f"{sub} {timing['count']}x{timing['p50'] * 1000:.2f}ms"
+                                          for sub, timing in sorted(results[key]['substages'].items()))
+                    print(f"{key:<28} {results[key]['seconds']:>10.3f} {results[key]['relative']:>8.2f}x "
+                          f"{results[key]['peak_bytes'] / 1e6:>9.1f}  {substages}")
+    finally:
+        server.stop()
+    print(f"Stand-in server handled {server.requests} requests; outputs in {workdir}")
+
+    if output_file:
+        with open(output_file, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(baseline_file):
+            with open(baseline_file, 'r') as file:
+                baseline = json.load(file)
+        baseline.update({key: {'relative': r['relative'], 'peak_bytes': r['peak_bytes']} for key, r in results.items()})
+        with open(baseline_file, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"Baseline updated: {baseline_file}")
+        return
+
+    with open(baseline_file, 'r') as file:
+        failures = compare(results, json.load(file), args.tolerance, pipelines, sizes)
+    if failures:
+        print("Regressions over baseline:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("No regressions over baseline.")
+
+
+if __name__ == "__main__":
+    main()
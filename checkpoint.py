@@ -0,0 +1,56 @@
+import json
+import logging
+import os
+import time
+
+
+def atomic_write_text(path, text):
+    """
+    Writes text to a temporary file, fsyncs it and renames it over path,
+    so an interrupted run leaves either the old file or the new one.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(path, data):
+    atomic_write_text(path, json.dumps(data))
+
+
+class Checkpoint:
+    """
+    Crawl frontier saved to a JSON file so an interrupted run can be resumed.
+    """
+
+    def __init__(self, path, interval=10.0):
+        self.path = path
+        self.interval = interval  # Minimum seconds between maybe_save() writes
+        self._last_saved = 0.0
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, state):
+        atomic_write_json(self.path, dict(state, saved_at=time.time()))
+        self._last_saved = time.monotonic()
+
+    def maybe_save(self, state):
+        if time.monotonic() - self._last_saved >= self.interval:
+            self.save(state)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,26 @@
-import requests
-from bs4 import BeautifulSoup
+import httpclient
+import json
+import time
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from io import BytesIO
 import logging
+import metrics
 
 # Setup logging
 logging.basicConfig(filename='github_search_results.log', filemode='w', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+metrics.setup('github')
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Profile enrichment settings
+GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+GRAPHQL_BATCH_SIZE = 100  # Aliased user(login:) lookups per GraphQL request
+PROFILE_CACHE_FILE = 'github_profile_cache.json'
+PROFILE_CACHE_TTL = 24 * 60 * 60  # Seconds before a cached profile is refetched
+LINE_HEIGHT = 12  # Points between lines of a result in the PDF
+PROFILE_FIELDS = "login bio company location followers { totalCount } repositories { totalCount }"
 
 def get_github_api_key():
     use_key = input("Do you want to use a GitHub API key for higher rate limits? (yes/no): ").strip().lower()
@@ -45,46 +58,134 @@ def fetch_from_github_api(query, search_type='users', api_key=None):
     if api_key:
         headers['Authorization'] = f'token {api_key}'
 
-    url = f"https://api.github.com/search/{search_type}?q={query}"
-    response = requests.get(url, headers=headers)
+    url = f"{GITHUB_API_URL}/search/{search_type}?q={query}"
+    try:
+        response = httpclient.get(url, headers=headers)
+    except httpclient.HttpError as e:
+        logging.error(f"API request failed: {e}")
+        return None
     if response.status_code == 200:
         return response.json()
     else:
         logging.error(f"API request failed with status code {response.status_code}: {response.json().get('message')}")
         return None
 
-def scrape_github_profile(url):
-    # Note: Scraping GitHub profiles is against GitHub's Terms of Service.
-    # This function is provided for educational purposes only.
+def load_profile_cache():
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        bio = soup.select_one('div.user-profile-bio').text.strip() if soup.select_one('div.user-profile-bio') else "No bio available"
-        return bio
-    except Exception as e:
-        logging.error(f"Error scraping GitHub profile: {e}")
-        return "Scraping error"
-
-def create_pdf(results, filename="search_results.pdf"):
+        with open(PROFILE_CACHE_FILE, 'r') as cache_file:
+            return json.load(cache_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_profile_cache(cache):
+    with open(PROFILE_CACHE_FILE, 'w') as cache_file:
+        json.dump(cache, cache_file)
+
+def build_profile_query(logins):
+    # Each login gets its own variable and alias so one request can look up many users
+    variables = {f"l{idx}": login for idx, login in enumerate(logins)}
+    params = ", ".join(f"$l{idx}: String!" for idx in range(len(logins)))
+    fields = "\n".join(f"u{idx}: user(login: $l{idx}) {{ {PROFILE_FIELDS} }}" for idx in range(len(logins)))
+    return f"query({params}) {{\n{fields}\n}}", variables
+
+def parse_profile(user):
+    if not user:
+        return None
+    return {
+        'bio': user.get('bio') or "No bio available",
+        'company': user.get('company') or "",
+        'location': user.get('location') or "",
+        'followers': user['followers']['totalCount'],
+        'repos': user['repositories']['totalCount'],
+    }
+
+def fetch_github_profiles(logins, api_key=None):
+    """
+    Returns {login: profile} for the given logins using batched GraphQL queries.
+    Profiles are cached per login for PROFILE_CACHE_TTL seconds; unknown logins map to None.
+    """
+    cache = load_profile_cache()
+    now = time.time()
+    profiles = {}
+    missing = []
+    for login in dict.fromkeys(logins):
+        entry = cache.get(login)
+        if entry and now - entry['fetched_at'] < PROFILE_CACHE_TTL:
+            profiles[login] = entry['profile']
+        else:
+            missing.append(login)
+
+    if missing and not api_key:
+        logging.warning(f"Skipping profile enrichment for {len(missing)} users: the GraphQL API requires an API key")
+        missing = []
+
+    headers = {'Authorization': f'bearer {api_key}'}
+    for start in range(0, len(missing), GRAPHQL_BATCH_SIZE):
+        batch = missing[start:start + GRAPHQL_BATCH_SIZE]
+        query, variables = build_profile_query(batch)
+        try:
+            response = httpclient.post(GRAPHQL_URL, json={'query': query, 'variables': variables}, headers=headers)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpclient.HttpError, ValueError) as e:
+            logging.error(f"GraphQL profile request failed: {e}")
+            continue
+
+        # Rate limits and malformed queries come back as HTTP 200 with errors and no data;
+        # treat the whole batch as failed rather than caching it as unknown users
+        data = payload.get('data')
+        errors = payload.get('errors')
+        if not data:
+            logging.error(f"GraphQL profile request failed: {errors or 'no data returned'}")
+            continue
+        if errors:
+            logging.warning(f"GraphQL profile request returned errors: {errors}")
+
+        for idx, login in enumerate(batch):
+            alias = f"u{idx}"
+            if alias not in data:
+                continue
+            # A null alias means the user doesn't exist, which is safe to cache
+            profile = parse_profile(data[alias])
+            profiles[login] = profile
+            cache[login] = {'fetched_at': now, 'profile': profile}
+        logging.info(f"Fetched {len(batch)} profiles in one GraphQL request")
+
+    save_profile_cache(cache)
+    return profiles
+
+def create_pdf(results, filename="search_results.pdf", api_key=None):
     c = canvas.Canvas(filename, pagesize=letter)
     width, height = letter
     y_position = height - 100
 
-    for item in results.get('items', []):
+    items = results.get('items', [])
+    profiles = fetch_github_profiles([item.get('login') for item in items if item.get('login')], api_key)
+    # Download every avatar concurrently over the shared connection pool
+    avatars = httpclient.get_many([item.get('avatar_url', '') for item in items])
+
+    for item, response in zip(items, avatars):
         username = item.get('login')
         user_url = item.get('html_url')
-        bio = scrape_github_profile(user_url)  # Scraping for educational purposes
+        profile = profiles.get(username)
+        bio = profile['bio'] if profile else "No bio available"
 
         try:
-            avatar_url = item.get('avatar_url', '')
-            response = requests.get(avatar_url)
-            img = ImageReader(BytesIO(response.content))
-            c.drawImage(img, 40, y_position - 45, width=50, height=50)
-
-            text = f"Username: {username}\nBio: {bio}\nURL: {user_url}"
-            c.drawString(100, y_position, text)
+            if isinstance(response, Exception):
+                raise response
+            with metrics.timer('render'):
+                img = ImageReader(BytesIO(response.content))
+                c.drawImage(img, 40, y_position - 45, width=50, height=50)
+
+            lines = [f"Username: {username}", f"Bio: {bio}", f"URL: {user_url}"]
+            if profile:
+                lines += [f"Company: {profile['company']}", f"Location: {profile['location']}",
+                          f"Followers: {profile['followers']}", f"Repositories: {profile['repos']}"]
+            # drawString doesn't break on newlines, so draw each field on its own line
+            for line_idx, line in enumerate(lines):
+                c.drawString(100, y_position - line_idx * LINE_HEIGHT, line)
             c.linkURL(user_url, (40, y_position - 45, 40 + 50, y_position + 5), thickness=1)
-            y_position -= 100
+            y_position -= max(100, len(lines) * LINE_HEIGHT + 20)
 
             if y_position < 100:
                 c.showPage()
@@ -92,7 +193,8 @@ def create_pdf(results, filename="search_results.pdf"):
         except Exception as e:
             logging.error(f"Failed to add user {username} to PDF: {e}")
 
-    c.save()
+    with metrics.timer('write'):
+        c.save()
     logging.info(f"PDF created: {filename}")
 
 def main_menu():
@@ -104,7 +206,7 @@ def main_menu():
             query = get_search_query()
             results = fetch_from_github_api(query, api_key=api_key)
             if results:
-                create_pdf(results, "GitHub_Search_Results.pdf")
+                create_pdf(results, "GitHub_Search_Results.pdf", api_key)
                 print("Search results have been saved to GitHub_Search_Results.pdf")
             else:
                 print("Failed to fetch results or no results to display.")
@@ -1,12 +1,14 @@
-import requests
+import httpclient
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from io import BytesIO
 import logging
+import metrics
 
 # Setup logging
 logging.basicConfig(filename='github_search_results.log', level=logging.INFO, format='%(asctime)s - %(message)s')
+metrics.setup('github')
 
 def fetch_from_github_api(query, search_type='users'):
     """
@@ -16,13 +18,13 @@ def fetch_from_github_api(query, search_type='users'):
     url = f"{base_url}{search_type}?q={query}"
     headers = {'Accept': 'application/vnd.github.v3+json'}
     try:
-        response = requests.get(url, headers=headers)
+        response = httpclient.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.HTTPError as e:
-        logging.error(f"HTTPError during API call: {e}")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"RequestException during API call: {e}")
+    except httpclient.HttpError as e:
+        logging.error(f"HttpError during API call: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid JSON in API response: {e}")
     return {'items': []}  # Return an empty list on error
 
 def create_pdf(results, filename="search_results.pdf", search_type='users'):
@@ -34,15 +36,20 @@ def create_pdf(results, filename="search_results.pdf", search_type='users'):
     width, height = letter
     y_position = height - 100
 
-    for item in results.get('items', []):
+    items = results.get('items', [])
+    # Download every avatar concurrently over the shared connection pool
+    avatars = httpclient.get_many([item.get('avatar_url', item.get('owner', {}).get('avatar_url', '')) for item in items])
+
+    for item, response in zip(items, avatars):
         try:
             name = item.get('login', item.get('name', 'N/A'))
             url = item['html_url']
-            avatar_url = item.get('avatar_url', item.get('owner', {}).get('avatar_url', ''))
 
-            response = requests.get(avatar_url)
-            img = ImageReader(BytesIO(response.content))
-            c.drawImage(img, 40, y_position - 20, width=60, height=60)
+            if isinstance(response, Exception):
+                raise response
+            with metrics.timer('render'):
+                img = ImageReader(BytesIO(response.content))
+                c.drawImage(img, 40, y_position - 20, width=60, height=60)
 
             c.drawString(110, y_position, name)
             c.linkURL(url, (100, y_position - 20, 500, y_position + 20), thickness=1)
@@ -55,7 +62,8 @@ def create_pdf(results, filename="search_results.pdf", search_type='users'):
         except Exception as e:
             logging.error(f"Error generating PDF content: {e}")
 
-    c.save()
+    with metrics.timer('write'):
+        c.save()
 
 def log_results(results, search_type='users'):
     """
@@ -0,0 +1,385 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from multidict import CIMultiDict
+
+import metrics
+
+# Defaults shared by every tool; override per client through HttpClient(...)
+DEFAULT_TIMEOUT = 30          # Seconds for a whole attempt
+DEFAULT_CONNECT_TIMEOUT = 10  # Seconds to establish a connection
+DEFAULT_READ_TIMEOUT = 30     # Seconds without data before a streamed download is abandoned
+DEFAULT_LIMIT_PER_HOST = 8    # Pooled connections per host
+DEFAULT_MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5            # First retry waits up to this many seconds
+BACKOFF_CAP = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Transient failures worth another attempt; anything else (bad URL, bad payload...) fails straight away
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, aiohttp.ServerDisconnectedError, asyncio.TimeoutError)
+
+# Directory for the optional on-disk cache of GET responses; unset disables it
+CACHE_ENV = "TOOLS_HTTP_CACHE"
+DEFAULT_CACHE_TTL = 60 * 60
+
+
+class HttpError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class Response:
+    """
+    Fully read response with the requests-style attributes the tools already use.
+    """
+
+    def __init__(self, url, status_code, headers, content, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CIMultiDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        charset = 'utf-8'
+        content_type = self.headers.get('Content-Type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=', 1)[1].split(';')[0].strip()
+        return self.content.decode(charset, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpError(f"{self.status_code} error for {self.url}", self.status_code)
+
+
+class RetryBudget:
+    """
+    Caps retries across all requests at min_retries plus ratio of the requests made,
+    so a failing host can't multiply the load on it.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self):
+        with self._lock:
+            if self.retries < self.min_retries + self.ratio * self.requests:
+                self.retries += 1
+                return True
+            return False
+
+
+class DiskCache:
+    """
+    Stores GET responses as <key>.json metadata plus <key>.body, revalidating
+    stale entries with ETag/Last-Modified when the server provided them.
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.body"
+
+    def get(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as file:
+                meta = json.load(file)
+            with open(body_path, 'rb') as file:
+                body = file.read()
+        except (OSError, ValueError):
+            return None
+        meta['fresh'] = time.time() - meta['stored_at'] < self.ttl
+        return meta, body
+
+    def put(self, url, response):
+        meta_path, body_path = self._paths(url)
+        meta = {'url': url, 'status_code': response.status_code, 'headers': dict(response.headers), 'stored_at': time.time()}
+        # Body first, then metadata, each via rename, so a partial write never looks valid
+        for path, mode, payload in ((body_path, 'wb', response.content), (meta_path, 'w', json.dumps(meta))):
+            with open(f"{path}.tmp", mode) as file:
+                file.write(payload)
+            os.replace(f"{path}.tmp", path)
+
+    def touch(self, url):
+        meta_path, _ = self._paths(url)
+        cached = self.get(url)
+        if cached:
+            meta, _ = cached
+            meta['stored_at'] = time.time()
+            meta.pop('fresh')
+            with open(f"{meta_path}.tmp", 'w') as file:
+                json.dump(meta, file)
+            os.replace(f"{meta_path}.tmp", meta_path)
+
+
+def backoff_delay(attempt, retry_after=None):
+    # Full jitter: anywhere between 0 and the capped exponential delay
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_CAP)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    try:
+        return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    """
+    Async HTTP client with pooled per-host connections, timeouts, jittered
+    exponential backoff under a shared retry budget, and an optional disk cache.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 limit_per_host=DEFAULT_LIMIT_PER_HOST, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 retry_budget=None, cache=None, headers=None):
+        # sock_connect rather than connect: the latter also counts time queued for a pooled connection
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout)
+        self.limit_per_host = limit_per_host
+        self.max_attempts = max_attempts
+        self.retry_budget = retry_budget or RetryBudget()
+        self.cache = cache
+        self.headers = headers or {}
+        self._session = None
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, headers=self.headers)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def request(self, method, url, headers=None, use_cache=True, **kwargs):
+        """
+        Sends a request and returns a Response. Connection errors, timeouts and
+        retryable statuses are retried; other error statuses are returned as-is.
+        """
+        cached = None
+        headers = dict(headers or {})
+        if self.cache and use_cache and method == 'GET' and not kwargs:
+            cached = self.cache.get(url)
+            if cached:
+                meta, body = cached
+                if meta['fresh']:
+                    metrics.count('cache_hits_total', 'fetch')
+                    return Response(url, meta['status_code'], meta['headers'], body, from_cache=True)
+                cached_headers = CIMultiDict(meta['headers'])
+                if 'ETag' in cached_headers:
+                    headers['If-None-Match'] = cached_headers['ETag']
+                if 'Last-Modified' in cached_headers:
+                    headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        response = await self._send(method, url, headers=headers, **kwargs)
+
+        if cached and response.status_code == 304:
+            meta, body = cached
+            self.cache.touch(url)
+            metrics.count('cache_revalidations_total', 'fetch')
+            return Response(url, meta['status_code'], meta['headers'], body, from_cache=True)
+        if self.cache and use_cache and method == 'GET' and not kwargs and response.status_code == 200:
+            self.cache.put(url, response)
+        return response
+
+    async def download(self, url, path, chunk_size=64 * 1024, **kwargs):
+        """
+        Streams a large response body to path without holding it in memory; returns bytes written.
+        """
+        # No total limit, which would cut off a long but healthy stream; give up only when it stalls
+        kwargs.setdefault('timeout', aiohttp.ClientTimeout(total=None, sock_connect=self.timeout.sock_connect,
+                                                           sock_read=DEFAULT_READ_TIMEOUT))
+        response = await self._send('GET', url, stream_to=path, chunk_size=chunk_size, **kwargs)
+        response.raise_for_status()
+        return int(response.headers.get('X-Bytes-Written', 0))
+
+    async def _send(self, method, url, stream_to=None, chunk_size=64 * 1024, **kwargs):
+        session = await self._get_session()
+        self.retry_budget.record_request()
+        attempt = 0
+        while True:
+            retry_after = None
+            response = None
+            try:
+                with metrics.timer('fetch'):
+                    async with session.request(method, url, **kwargs) as resp:
+                        if stream_to and resp.status < 400:
+                            written = await self._stream_body(resp, stream_to, chunk_size)
+                            headers = dict(resp.headers, **{'X-Bytes-Written': str(written)})
+                            return Response(str(resp.url), resp.status, headers, b'')
+                        content = await resp.read()
+                        metrics.add_bytes('fetch', len(content))
+                        response = Response(str(resp.url), resp.status, dict(resp.headers), content)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                error = HttpError(f"{response.status_code} error for {url}", response.status_code)
+            except RETRY_EXCEPTIONS as e:
+                error = HttpError(f"{method} {url} failed: {e!r}")
+            except aiohttp.ClientError as e:
+                raise HttpError(f"{method} {url} failed: {e!r}") from e
+
+            attempt += 1
+            if attempt >= self.max_attempts or not self.retry_budget.try_spend():
+                # Out of attempts: hand back the last error response, or raise if there wasn't one
+                if response is not None:
+                    return response
+                raise error
+            delay = backoff_delay(attempt - 1, retry_after)
+            metrics.retry('fetch')
+            logging.warning(f"Retry {attempt} for {url} in {delay:.1f}s: {error}")
+            await asyncio.sleep(delay)
+
+    async def _stream_body(self, resp, path, chunk_size):
+        written = 0
+        tmp_path = f"{path}.part"
+        try:
+            with open(tmp_path, 'wb') as file:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    file.write(chunk)
+                    written += len(chunk)
+        except BaseException:
+            # Don't leave a truncated file behind when the stream fails partway
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        os.replace(tmp_path, path)
+        metrics.add_bytes('fetch', written)
+        return written
+
+
+# One client per event loop shares the retry budget and cache across tools in the process
+shared_budget = RetryBudget()
+_clients = {}
+
+
+def _default_cache():
+    directory = os.environ.get(CACHE_ENV)
+    return DiskCache(directory) if directory else None
+
+
+def get_client():
+    """
+    Returns the shared HttpClient for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = HttpClient(retry_budget=shared_budget, cache=_default_cache())
+        _clients[loop] = client
+    return client
+
+
+async def close_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client:
+        await client.close()
+
+
+# Synchronous scripts share a client running on a background event loop thread,
+# so their connections stay pooled between calls.
+_background_loop = None
+_background_lock = threading.Lock()
+
+
+def _run(coro):
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, name="httpclient", daemon=True).start()
+            atexit.register(_shutdown_background_loop)
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop).result()
+
+
+def _shutdown_background_loop():
+    asyncio.run_coroutine_threadsafe(close_client(), _background_loop).result()
+    _background_loop.call_soon_threadsafe(_background_loop.stop)
+
+
+async def _call(name, *args, **kwargs):
+    return await getattr(get_client(), name)(*args, **kwargs)
+
+
+def request(method, url, **kwargs):
+    return _run(_call('request', method, url, **kwargs))
+
+
+def get(url, **kwargs):
+    return _run(_call('get', url, **kwargs))
+
+
+def post(url, **kwargs):
+    return _run(_call('post', url, **kwargs))
+
+
+def download(url, path, **kwargs):
+    return _run(_call('download', url, path, **kwargs))
+
+
+def get_many(urls, **kwargs):
+    """
+    Fetches urls concurrently; returns a Response or HttpError per url, in order.
+    Empty urls aren't requested and get an HttpError.
+    """
+    async def gather():
+        client = get_client()
+        # Only start as many requests as the pool can serve, so queued ones don't run out their timeouts
+        slots = asyncio.Semaphore(client.limit_per_host)
+
+        async def fetch(url):
+            if not url:
+                raise HttpError("No URL given")
+            async with slots:
+                return await client.get(url, **kwargs)
+
+        return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+    return _run(gather())
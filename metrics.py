@@ -0,0 +1,160 @@
+import atexit
+import json
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+# Metrics are switched on per run with the TOOLS_METRICS environment variable:
+#   unset, "" or "0"  - disabled, every call below returns immediately
+#   "1"               - JSON summary in metrics/<tool>_<timestamp>.json
+#   any other value   - output path; ".prom" or ".txt" writes Prometheus text format, anything else JSON
+METRICS_ENV = "TOOLS_METRICS"
+metrics_directory = "metrics"
+QUANTILES = (0.5, 0.95, 0.99)
+
+enabled = False
+tool_name = None
+output_path = None
+started_at = None
+observations = defaultdict(list)  # (name, stage) -> durations in seconds
+counters = defaultdict(float)     # (name, stage) -> running total
+
+
+class _NullTimer:
+    # Shared no-op context manager so disabled timers cost one function call
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_timer = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observations[('stage_seconds', self.stage)].append(time.perf_counter() - self.start)
+        return False
+
+
+def setup(tool, path=None):
+    """
+    Enables metrics for this run if TOOLS_METRICS (or path) is set, and writes them at exit.
+    """
+    global enabled, tool_name, output_path, started_at
+    path = path or os.environ.get(METRICS_ENV, "")
+    if path in ("", "0"):
+        return
+    if path == "1":
+        os.makedirs(metrics_directory, exist_ok=True)
+        path = os.path.join(metrics_directory, f"{tool}_{datetime.now().strftime('%Y%m%d%H%M%S')}.json")
+
+    enabled = True
+    tool_name = tool
+    output_path = path
+    started_at = time.time()
+    atexit.register(write)
+
+
+def timer(stage):
+    """
+    Context manager recording the wall-clock duration of a stage (fetch, navigate, parse, ocr, render, write).
+    """
+    if not enabled:
+        return _null_timer
+    return _Timer(stage)
+
+
+def observe(stage, seconds):
+    if enabled:
+        observations[('stage_seconds', stage)].append(seconds)
+
+
+def count(name, stage, amount=1):
+    if enabled:
+        counters[(name, stage)] += amount
+
+
+def add_bytes(stage, amount):
+    if enabled and amount:
+        counters[('bytes_total', stage)] += amount
+
+
+def retry(stage):
+    if enabled:
+        counters[('retries_total', stage)] += 1
+
+
+def quantile(values, q):
+    # Nearest-rank quantile over the sorted observations
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summary():
+    stages = {}
+    for (name, stage), values in observations.items():
+        stages.setdefault(stage, {})[name] = {
+            'count': len(values),
+            'sum': sum(values),
+            **{f"p{int(q * 100)}": quantile(values, q) for q in QUANTILES},
+        }
+    for (name, stage), total in counters.items():
+        stages.setdefault(stage, {})[name] = total
+    return {
+        'tool': tool_name,
+        'started_at': datetime.fromtimestamp(started_at).isoformat() if started_at else None,
+        'duration_seconds': time.time() - started_at if started_at else 0,
+        'stages': stages,
+    }
+
+
+def prometheus_text():
+    def labels(stage):
+        return f'tool="{tool_name}",stage="{stage}"'
+
+    lines = []
+    by_name = defaultdict(list)
+    for (name, stage), values in sorted(observations.items()):
+        by_name[name].append((stage, values))
+    for name, series in by_name.items():
+        lines.append(f"# TYPE tools_{name} summary")
+        for stage, values in series:
+            for q in QUANTILES:
+                lines.append(f'tools_{name}{{{labels(stage)},quantile="{q}"}} {quantile(values, q)}')
+            lines.append(f"tools_{name}_sum{{{labels(stage)}}} {sum(values)}")
+            lines.append(f"tools_{name}_count{{{labels(stage)}}} {len(values)}")
+
+    by_name = defaultdict(list)
+    for (name, stage), total in sorted(counters.items()):
+        by_name[name].append((stage, total))
+    for name, series in by_name.items():
+        lines.append(f"# TYPE tools_{name} counter")
+        for stage, total in series:
+            lines.append(f"tools_{name}{{{labels(stage)}}} {total}")
+    return "\n".join(lines) + "\n"
+
+
+def write():
+    if not enabled:
+        return
+    try:
+        with open(output_path, 'w') as file:
+            if output_path.endswith(('.prom', '.txt')):
+                file.write(prometheus_text())
+            else:
+                json.dump(summary(), file, indent=2)
+        logging.info(f"Metrics written to {output_path}")
+    except OSError as e:
+        logging.error(f"Error writing metrics to {output_path}: {e}")
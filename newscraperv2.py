@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import os
 import urllib.parse
@@ -6,11 +7,16 @@ from pyppeteer import launch
 from pyppeteer.errors import NetworkError, PageError
 import websockets.exceptions
 import logging
-import requests
+import metrics
+from articlelinks import collect_articles
+import httpclient
 import random
+from proxystore import load_proxies
+from checkpoint import Checkpoint
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
+metrics.setup('news')
 
 # User agent to mimic Google bot
 user_agent_str = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
@@ -20,17 +26,22 @@ output_directory = "Saved_Articles"
 if not os.path.exists(output_directory):
     os.makedirs(output_directory)
 
-# Proxy list URL
+# Pending and completed links for every unfinished query, so --resume can finish interrupted or partly failed batches
+checkpoint = Checkpoint('news_checkpoint.json')
+frontiers = {}  # Query -> checkpoint entry, loaded in main()
+
+# Proxy list URL, only fetched when the local proxy store is unavailable
 proxy_list_url = "https://raw.githubusercontent.com/Bob-Bragg/Tools/main/httpproxies28.txt"
+proxy_snapshot = "httpproxies28.txt"
 
 # Function to scrape proxies directly from a given URL
-def scrape_proxies_from_url(url):
+async def scrape_proxies_from_url(url):
     try:
-        response = requests.get(url)
+        response = await httpclient.get_client().get(url)
         response.raise_for_status()
         proxies = response.text.split('\n')
         return [proxy.strip() for proxy in proxies if proxy.strip()]
-    except requests.RequestException as e:
+    except httpclient.HttpError as e:
         logging.error(f"Error scraping proxies: {e}")
         return []
 
@@ -52,7 +63,8 @@ async def scrape_and_save_article(browser, link, idx, search_query, proxies, max
 
             page = await browser.newPage()
             await page.setUserAgent(user_agent_str)
-            await page.goto(link, args=browser_args)
+            with metrics.timer('navigate'):
+                await page.goto(link, args=browser_args)
             await asyncio.sleep(2)  # Adjust sleep time as needed
 
             # Get the entire HTML content of the page
@@ -72,12 +84,14 @@ async def scrape_and_save_article(browser, link, idx, search_query, proxies, max
             # Append the source link at the top of the page content
             full_content = f"Source URL: {link}\n\n{page_content}"
 
-            with open(file_name, "w", encoding="utf-8") as file:
+            with metrics.timer('write'), open(file_name, "w", encoding="utf-8") as file:
                 file.write(full_content)
+            metrics.add_bytes('write', len(full_content))
 
             logging.info(f"Article {idx + 1} saved: {file_name}")
-            return
+            return True
         except (NetworkError, PageError, websockets.exceptions.ConnectionClosedError) as e:
+            metrics.retry('navigate')
             logging.warning(f"Retrying with different proxy (attempt {retry + 1}) - {str(e)}")
             await asyncio.sleep(5)
         finally:
@@ -85,6 +99,7 @@ async def scrape_and_save_article(browser, link, idx, search_query, proxies, max
                 await page.close()
 
     logging.error(f"Failed to scrape and save article {idx + 1} after {max_retries} retries.")
+    return False
 
 # Function to get a limited number of article links
 async def get_article_links(query, max_articles):
@@ -92,30 +107,89 @@ async def get_article_links(query, max_articles):
     browser = await launch(headless=True)
     page = await browser.newPage()
     await page.setUserAgent(user_agent_str)
-    await page.goto(search_url)
+    with metrics.timer('navigate'):
+        await page.goto(search_url)
     await page.waitForSelector('article')
 
-    article_elements = await page.querySelectorAll('article')
-    links = [await page.evaluate('(article) => article.querySelector("a") ? article.querySelector("a").href : null', article) for article in article_elements]
+    articles = await collect_articles(page, max_articles)
+    links = [article['href'] for article in articles if article['href']]
 
     await browser.close()
     return links[:max_articles]
 
+def frontier_state(max_articles, article_links, completed):
+    done = set(completed)
+    return {
+        'max_articles': max_articles,
+        'pending': [link for link in article_links if link not in done],
+        'completed': list(completed),
+    }
+
+def checkpoint_state():
+    return {'queries': frontiers}
+
 # Function to perform the scraping process
-async def scrape_articles(search_query, max_articles, proxies):
+async def scrape_articles(search_query, max_articles, proxies, pending=None, completed=None):
+    """
+    Scrapes the links found for search_query, or only the pending links when resuming.
+    The query's checkpoint entry is kept until every link has been saved.
+    """
     browser = None
+    article_links = pending
+    completed = list(completed or [])
+
+    async def scrape_and_record(link, idx):
+        if await scrape_and_save_article(browser, link, idx, search_query, proxies):
+            completed.append(link)
+            frontiers[search_query] = frontier_state(max_articles, article_links, completed)
+            checkpoint.maybe_save(checkpoint_state())
+
     try:
-        article_links = await get_article_links(search_query, max_articles)
+        if article_links is None:
+            found = await get_article_links(search_query, max_articles)
+            # Searching again for an unfinished query keeps its failed links and skips the saved ones
+            earlier = frontiers.get(search_query, {'pending': [], 'completed': []})
+            seen = set(earlier['pending']) | set(earlier['completed'])
+            article_links = earlier['pending'] + [link for link in found if link not in seen]
+            completed = list(earlier['completed'])
+        frontiers[search_query] = frontier_state(max_articles, article_links, completed)
+        checkpoint.save(checkpoint_state())
         browser = await launch(headless=True)
-        tasks = [scrape_and_save_article(browser, link, idx, search_query, proxies) for idx, link in enumerate(article_links)]
+        offset = len(completed)
+        tasks = [scrape_and_record(link, offset + idx) for idx, link in enumerate(article_links)]
         await asyncio.gather(*tasks)
     finally:
+        if article_links is not None:
+            frontiers[search_query] = frontier_state(max_articles, article_links, completed)
+            checkpoint.save(checkpoint_state())
         if browser:
             await browser.close()
 
+    remaining = len(frontiers[search_query]['pending'])
+    if remaining:
+        logging.warning(f"{remaining} articles failed; rerun with --resume to retry them")
+        return
+    del frontiers[search_query]
+    if frontiers:
+        checkpoint.save(checkpoint_state())
+    else:
+        checkpoint.clear()
+
 # Main loop for user interaction
-async def main():
-    proxies = scrape_proxies_from_url(proxy_list_url)
+async def main(resume=False):
+    proxies = load_proxies(proxy_snapshot)
+    if not proxies:
+        proxies = await scrape_proxies_from_url(proxy_list_url)
+
+    frontiers.update((checkpoint.load() or {}).get('queries', {}))
+    if resume:
+        if not frontiers:
+            logging.info("No checkpoint found, starting a new search.")
+        for query, state in list(frontiers.items()):
+            logging.info(f"Resuming query '{query}': {len(state['pending'])} pending, {len(state['completed'])} completed")
+            await scrape_articles(query, state['max_articles'], proxies, state['pending'], state['completed'])
+    elif frontiers:
+        logging.warning(f"{len(frontiers)} earlier queries have unfinished articles; rerun with --resume to retry them")
 
     while True:
         search_query = input("Enter your search query (or 'exit' to quit): ")
@@ -129,6 +203,11 @@ async def main():
         await scrape_articles(search_query, max_articles, proxies)
 
     logging.info("Scraping completed.")
+    await httpclient.close_client()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Search Google News and save the matching articles.")
+    parser.add_argument("--resume", action="store_true", help="Finish the interrupted query from the last checkpoint first")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.resume))
@@ -1,26 +1,38 @@
 import asyncio
 from pyppeteer import launch
 import urllib.parse
+import logging
+import metrics
+from articlelinks import collect_articles
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+metrics.setup('news')
 
 class GoogleScraper:
-    def __init__(self, query, timeframe='18h'):
+    def __init__(self, query, timeframe='18h', max_articles=None):
         base_url = 'https://news.google.com/search'
         encoded_query = urllib.parse.quote_plus(f'{query} when:{timeframe}')
         self.url = f'{base_url}?q={encoded_query}&hl=en-US&gl=US&ceid=US:en'
+        self.max_articles = max_articles
         self.news_articles = []
 
     async def scrape(self):
         browser = await launch()
         page = await browser.newPage()
-        await page.goto(self.url)
+        with metrics.timer('navigate'):
+            await page.goto(self.url)
         await page.waitForSelector('article')
 
-        article_elements = await page.querySelectorAll('article')
+        articles = await collect_articles(page, self.max_articles, evaluates_per_article=2)
 
-        for article in article_elements:
-            article_text = await page.evaluate('(article) => article.innerText', article)
-            article_link = await page.evaluate('(article) => article.querySelector("a") ? article.querySelector("a").href : null', article)
-            self.news_articles.append({'article': article_text, 'article_links': article_link})
+        for article in articles:
+            self.news_articles.append({
+                'article': article['text'],
+                'article_links': article['href'],
+                'source': article['source'],
+                'timestamp': article['timestamp'],
+            })
 
         await browser.close()
 
@@ -6,9 +6,12 @@ from pyppeteer import launch
 from pyppeteer.errors import NetworkError, PageError
 import websockets.exceptions
 import logging
+import metrics
+from articlelinks import collect_articles
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
+metrics.setup('news')
 
 # User agent to mimic Google bot
 user_agent = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
@@ -25,7 +28,8 @@ async def scrape_and_save_article(browser, link, idx, search_query, max_retries=
         try:
             page = await browser.newPage()
             await page.setUserAgent(user_agent)
-            await page.goto(link)
+            with metrics.timer('navigate'):
+                await page.goto(link)
             await asyncio.sleep(2)  # Adjust sleep time as needed
 
             # Get the entire HTML content of the page
@@ -42,12 +46,14 @@ async def scrape_and_save_article(browser, link, idx, search_query, max_retries=
             timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
             file_name = os.path.join(output_directory, f"{timestamp}_{search_query}_{valid_title}_{idx + 1}.html")
 
-            with open(file_name, "w", encoding="utf-8") as file:
+            with metrics.timer('write'), open(file_name, "w", encoding="utf-8") as file:
                 file.write(page_content)
+            metrics.add_bytes('write', len(page_content))
 
             logging.info(f"Article {idx + 1} saved: {file_name}")
             return
         except (NetworkError, PageError, websockets.exceptions.ConnectionClosedError) as e:
+            metrics.retry('navigate')
             logging.warning(f"Retrying (attempt {retry + 1}) - {str(e)}")
             await asyncio.sleep(5)
         finally:
@@ -62,11 +68,12 @@ async def get_article_links(query, max_articles):
     browser = await launch(headless=True)
     page = await browser.newPage()
     await page.setUserAgent(user_agent)
-    await page.goto(search_url)
+    with metrics.timer('navigate'):
+        await page.goto(search_url)
     await page.waitForSelector('article')
 
-    article_elements = await page.querySelectorAll('article')
-    links = [await page.evaluate('(article) => article.querySelector("a") ? article.querySelector("a").href : null', article) for article in article_elements]
+    articles = await collect_articles(page, max_articles)
+    links = [article['href'] for article in articles if article['href']]
 
     await browser.close()
     return links[:max_articles]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+import argparse
+import array
+import bisect
+import glob
+import ipaddress
+import logging
+import os
+import re
+import socket
+import struct
+import sys
+
+# Default locations of the raw snapshots and the consolidated store
+repo_directory = os.path.dirname(os.path.abspath(__file__))
+store_path = os.path.join(repo_directory, "proxies", "proxies.bin")
+
+# File layout: header, snapshot table, then column arrays.
+# Entries are sorted by (ip, port) so lookups can bisect the key column.
+STORE_MAGIC = b'PXS1'
+STORE_VERSION = 1
+HEADER = struct.Struct('<4sHHI')      # magic, version, snapshot count, entry count
+SNAPSHOT_HEADER = struct.Struct('<HI')  # name length, member count
+
+
+def default_snapshot_paths():
+    """
+    Returns the httpproxies*.txt snapshots in numeric order followed by the master list.
+    """
+    def snapshot_number(path):
+        match = re.search(r'httpproxies(\d*)\.txt$', path)
+        return int(match.group(1)) if match and match.group(1) else 0
+
+    paths = sorted(glob.glob(os.path.join(repo_directory, "httpproxies*.txt")), key=snapshot_number)
+    masterlist = os.path.join(repo_directory, "proxies", "masterlist.txt")
+    if os.path.exists(masterlist):
+        paths.append(masterlist)
+    return paths
+
+
+def parse_proxy(line):
+    """
+    Parses an "ip:port" line into an (IPv4 int, port) tuple, or None if it is not one.
+    """
+    host, sep, port = line.strip().rpartition(':')
+    if not sep or not port.isdigit():
+        return None
+    try:
+        ip = int(ipaddress.IPv4Address(host))
+    except ipaddress.AddressValueError:
+        return None
+    port = int(port)
+    if not 0 < port < 65536:
+        return None
+    return ip, port
+
+
+IPV4 = struct.Struct('>I')
+
+
+def format_proxy(ip, port):
+    return f"{socket.inet_ntoa(IPV4.pack(ip))}:{port}"
+
+
+def _native(arr):
+    # The on-disk format is little-endian
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+class ProxyStore:
+    """
+    Deduplicated proxy list packed as parallel (IPv4 int, port) arrays with
+    first-seen/last-seen snapshot indices and per-snapshot membership.
+    """
+
+    def __init__(self, snapshots, ips, ports, first_seen, last_seen, members):
+        self.snapshots = snapshots    # snapshot names, oldest first
+        self.ips = ips                # array('I')
+        self.ports = ports            # array('H')
+        self.first_seen = first_seen  # array('H') of snapshot indices
+        self.last_seen = last_seen    # array('H') of snapshot indices
+        self.members = members        # one sorted array('I') of entry indices per snapshot
+        self._keys = None
+
+    @classmethod
+    def from_snapshots(cls, paths):
+        seen = {}  # (ip, port) -> [first, last]
+        snapshot_entries = []
+        for snapshot_idx, path in enumerate(paths):
+            entries = set()
+            skipped = 0
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = parse_proxy(line)
+                    if entry is None:
+                        skipped += 1
+                        continue
+                    entries.add(entry)
+            for entry in entries:
+                if entry in seen:
+                    seen[entry][1] = snapshot_idx
+                else:
+                    seen[entry] = [snapshot_idx, snapshot_idx]
+            snapshot_entries.append(entries)
+            if skipped:
+                logging.warning(f"Skipped {skipped} malformed lines in {path}")
+
+        ordered = sorted(seen)
+        index = {entry: idx for idx, entry in enumerate(ordered)}
+        store = cls(
+            [os.path.relpath(path, repo_directory) for path in paths],
+            array.array('I', (ip for ip, _ in ordered)),
+            array.array('H', (port for _, port in ordered)),
+            array.array('H', (seen[entry][0] for entry in ordered)),
+            array.array('H', (seen[entry][1] for entry in ordered)),
+            [array.array('I', sorted(index[entry] for entry in entries)) for entries in snapshot_entries],
+        )
+        return store
+
+    @classmethod
+    def load(cls, path=store_path):
+        with open(path, 'rb') as file:
+            data = memoryview(file.read())
+
+        magic, version, n_snapshots, n_entries = HEADER.unpack_from(data, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise ValueError(f"{path} is not a version {STORE_VERSION} proxy store")
+        offset = HEADER.size
+
+        snapshots, counts = [], []
+        for _ in range(n_snapshots):
+            name_len, count = SNAPSHOT_HEADER.unpack_from(data, offset)
+            offset += SNAPSHOT_HEADER.size
+            snapshots.append(bytes(data[offset:offset + name_len]).decode('utf-8'))
+            counts.append(count)
+            offset += name_len
+
+        def take(typecode, count):
+            nonlocal offset
+            arr = array.array(typecode)
+            end = offset + count * arr.itemsize
+            arr.frombytes(data[offset:end])
+            offset = end
+            return _native(arr)
+
+        ips = take('I', n_entries)
+        ports = take('H', n_entries)
+        first_seen = take('H', n_entries)
+        last_seen = take('H', n_entries)
+        members = [take('I', count) for count in counts]
+        return cls(snapshots, ips, ports, first_seen, last_seen, members)
+
+    def save(self, path=store_path):
+        parts = [HEADER.pack(STORE_MAGIC, STORE_VERSION, len(self.snapshots), len(self))]
+        for name, members in zip(self.snapshots, self.members):
+            encoded = name.encode('utf-8')
+            parts.append(SNAPSHOT_HEADER.pack(len(encoded), len(members)))
+            parts.append(encoded)
+        for arr in (self.ips, self.ports, self.first_seen, self.last_seen, *self.members):
+            parts.append(_native(array.array(arr.typecode, arr)).tobytes())
+
+        # Write to a temporary file first so a reader never sees a partial store
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(b''.join(parts))
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.ips)
+
+    def _key_index(self, proxy):
+        if self._keys is None:
+            self._keys = array.array('Q', ((ip << 16) | port for ip, port in zip(self.ips, self.ports)))
+        entry = parse_proxy(proxy) if isinstance(proxy, str) else proxy
+        if entry is None:
+            return None
+        key = (entry[0] << 16) | entry[1]
+        idx = bisect.bisect_left(self._keys, key)
+        if idx < len(self._keys) and self._keys[idx] == key:
+            return idx
+        return None
+
+    def __contains__(self, proxy):
+        return self._key_index(proxy) is not None
+
+    def proxies(self, snapshot=None):
+        """
+        Returns "ip:port" strings for every entry, or only those in the given snapshot.
+        """
+        indices = range(len(self)) if snapshot is None else self.members[self._snapshot_index(snapshot)]
+        return [format_proxy(self.ips[idx], self.ports[idx]) for idx in indices]
+
+    def seen(self, proxy):
+        """
+        Returns the (first-seen, last-seen) snapshot names for a proxy, or None if unknown.
+        """
+        idx = self._key_index(proxy)
+        if idx is None:
+            return None
+        return self.snapshots[self.first_seen[idx]], self.snapshots[self.last_seen[idx]]
+
+    def _snapshot_index(self, snapshot):
+        if isinstance(snapshot, int):
+            return snapshot
+        for idx, name in enumerate(self.snapshots):
+            if snapshot in (name, os.path.basename(name)):
+                return idx
+        raise KeyError(f"Unknown snapshot: {snapshot}")
+
+    def snapshot_set(self, snapshot):
+        return set(self.members[self._snapshot_index(snapshot)])
+
+    def diff(self, old, new):
+        """
+        Returns (added, removed) proxy lists going from snapshot old to snapshot new.
+        """
+        old_set, new_set = self.snapshot_set(old), self.snapshot_set(new)
+        added = [format_proxy(self.ips[idx], self.ports[idx]) for idx in sorted(new_set - old_set)]
+        removed = [format_proxy(self.ips[idx], self.ports[idx]) for idx in sorted(old_set - new_set)]
+        return added, removed
+
+
+def load_proxies(snapshot=-1, path=store_path):
+    """
+    Loads the proxies from one snapshot (by name or index, default the last one built),
+    returning an empty list if the store or snapshot is missing or invalid.
+    Pass snapshot=None for every proxy ever seen.
+    """
+    try:
+        return ProxyStore.load(path).proxies(snapshot)
+    except (OSError, ValueError, KeyError, IndexError, struct.error) as e:
+        logging.error(f"Error loading proxy store {path}: {e}")
+        return []
+
+
+def main():
+    # Setup logging here rather than at import so importing scripts keep their own config
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Consolidate the httpproxies*.txt snapshots into a deduplicated proxy store.")
+    parser.add_argument("--store", default=store_path, help="Path to the binary proxy store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Merge snapshot files into the store")
+    build_parser.add_argument("snapshots", nargs='*', help="Snapshot files, oldest first (default: all httpproxies*.txt and proxies/masterlist.txt)")
+    subparsers.add_parser("stats", help="Show entry and snapshot counts")
+    diff_parser = subparsers.add_parser("diff", help="Show proxies added and removed between two snapshots")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    export_parser = subparsers.add_parser("export", help="Print proxies as ip:port lines")
+    export_parser.add_argument("--snapshot", help="Only export proxies from this snapshot")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        paths = args.snapshots or default_snapshot_paths()
+        store = ProxyStore.from_snapshots(paths)
+        store.save(args.store)
+        logging.info(f"Wrote {len(store)} unique proxies from {len(paths)} snapshots to {args.store}")
+        return
+
+    store = ProxyStore.load(args.store)
+    if args.command == "stats":
+        print(f"Unique proxies: {len(store)}")
+        for name, members in zip(store.snapshots, store.members):
+            print(f"{name}: {len(members)}")
+    elif args.command == "diff":
+        added, removed = store.diff(args.old, args.new)
+        for proxy in added:
+            print(f"+{proxy}")
+        for proxy in removed:
+            print(f"-{proxy}")
+    elif args.command == "export":
+        for proxy in store.proxies(args.snapshot):
+            print(proxy)
+
+
+if __name__ == "__main__":
+    main()
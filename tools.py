@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+# Single entry point for the tools. Nothing heavy is imported at module level:
+# each subcommand imports its own script (and with it pyppeteer, aiohttp,
+# reportlab, pytesseract...) only when it runs.
+
+repo_directory = os.path.dirname(os.path.abspath(__file__))
+
+# Quick invocations the lazy imports are meant to speed up: tools.py arguments, and
+# the modules the script imported at load time before this entry point existed.
+# news and github always need their full stack (browser, PDF), so they aren't here.
+QUICK_PATHS = {
+    'kev --cached': (['kev', '--cached'], ['requests', 'bs4', 'csv', 'logging', 'time', 'readline']),
+    'ocr': (['ocr', '{image}', 'keyword'], ['argparse', 'pytesseract', 'PIL.Image', 'argcomplete', 're', 'logging']),
+}
+
+
+def run_news(args):
+    import asyncio
+    import newscraperv2
+    asyncio.run(newscraperv2.main(args.resume))
+
+
+def run_kev(args):
+    import yeetumis
+    if args.cached is not None:
+        # Cache-only lookup: never touches the network stack
+        for cve in yeetumis.load_cves_from_cache():
+            if cve.startswith(args.cached):
+                print(cve)
+        return
+    yeetumis.main(args.resume)
+
+
+def run_github(args):
+    import githubbot
+    githubbot.main_menu()
+
+
+def run_ocr(args):
+    import metrics
+    import wordsearchocr
+    metrics.setup('ocr', args.metrics)
+    wordsearchocr.main(args.image_path, args.keywords)
+
+
+def import_time_us(command):
+    """
+    Runs command under -X importtime and returns (total import time in microseconds, wall seconds, error).
+    """
+    import subprocess
+    import tempfile
+    import time
+
+    # Run in a scratch directory since some scripts create log files and folders on import
+    env = dict(os.environ, PYTHONPATH=repo_directory, TOOLS_METRICS="0")
+    with tempfile.TemporaryDirectory() as scratch:
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', *command], cwd=scratch, env=env,
+                                capture_output=True, text=True, stdin=subprocess.DEVNULL)
+        wall = time.perf_counter() - start
+
+    total = 0
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_us = line.split(':', 1)[1].split('|')[0].strip()
+            if self_us.isdigit():
+                total += int(self_us)
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}"
+    return total, wall, error
+
+
+def write_blank_image(path):
+    from PIL import Image
+    Image.new('RGB', (200, 50), 'white').save(path)
+
+
+def run_startup_bench(args):
+    """
+    Times each quick path through this CLI against the same path run after the
+    script's old module-level imports, under -X importtime.
+    """
+    import importlib.util
+    import tempfile
+
+    tools_script = os.path.join(repo_directory, 'tools.py')
+    with tempfile.TemporaryDirectory() as image_directory:
+        image_path = args.image
+        if image_path is None:
+            image_path = os.path.join(image_directory, 'blank.png')
+            try:
+                write_blank_image(image_path)
+            except ImportError:
+                image_path = None
+
+        print(f"{'path':<16} {'eager import':>16} {'lazy import':>16} {'wall eager':>12} {'wall lazy':>12}")
+        for name, (command, eager_modules) in QUICK_PATHS.items():
+            if '{image}' in command:
+                if image_path is None:
+                    print(f"{name:<16} skipped: Pillow is needed to create a test image (or pass --image)")
+                    continue
+                command = [image_path if part == '{image}' else part for part in command]
+
+            # A module that isn't installed can't be part of the eager baseline; say so rather than fail
+            missing = [module for module in eager_modules if importlib.util.find_spec(module.split('.')[0]) is None]
+            eager_imports = ', '.join(module for module in eager_modules if module not in missing)
+            eager_code = f"import {eager_imports}\nimport sys, tools\nsys.argv = ['tools.py', *{command!r}]\ntools.main()"
+
+            eager_us, eager_wall, eager_error = import_time_us(['-c', eager_code])
+            lazy_us, lazy_wall, lazy_error = import_time_us([tools_script, *command])
+            print(f"{name:<16} {eager_us / 1000:>13.1f} ms {lazy_us / 1000:>13.1f} ms "
+                  f"{eager_wall * 1000:>9.1f} ms {lazy_wall * 1000:>9.1f} ms")
+            if missing:
+                print(f"  not installed, left out of the eager baseline: {', '.join(missing)}")
+            for run, error in (('eager', eager_error), ('lazy', lazy_error)):
+                if error:
+                    print(f"  {run} run failed: {error}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="News, CISA KEV, GitHub and OCR tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    news_parser = subparsers.add_parser("news", help="Search Google News and save articles")
+    news_parser.add_argument("--resume", action="store_true", help="Finish the interrupted query from the last checkpoint first")
+    news_parser.set_defaults(func=run_news)
+
+    kev_parser = subparsers.add_parser("kev", help="Scrape the CISA Known Exploited Vulnerabilities catalog")
+    kev_parser.add_argument("--cached", nargs='?', const='', metavar="PREFIX",
+                            help="List CVE IDs from the local cache (optionally matching PREFIX) without scraping")
+    kev_parser.add_argument("--resume", action="store_true", help="Continue from the last checkpoint instead of starting over")
+    kev_parser.set_defaults(func=run_kev)
+
+    github_parser = subparsers.add_parser("github", help="Search GitHub users and build a PDF report")
+    github_parser.set_defaults(func=run_github)
+
+    ocr_parser = subparsers.add_parser("ocr", help="Search for keywords in text extracted from an image")
+    ocr_parser.add_argument("image_path", help="Path to the image file")
+    ocr_parser.add_argument("keywords", nargs='+', help="Keywords to search for (multiple keywords allowed)")
+    ocr_parser.add_argument("--metrics", metavar="PATH", help="Write timing metrics to PATH (.prom for Prometheus text, otherwise JSON)")
+    ocr_parser.set_defaults(func=run_ocr)
+
+    bench_parser = subparsers.add_parser("startup-bench", help="Compare -X importtime totals for quick paths with eager imports vs this CLI")
+    bench_parser.add_argument("--image", help="Image for the ocr path (default: a generated blank image)")
+    bench_parser.set_defaults(func=run_startup_bench)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,10 @@
 import argparse
 import pytesseract
 from PIL import Image
-import argcomplete
 import re
+import os
 import logging
+import metrics
 
 # Configure logging
 logging.basicConfig(filename='ocr_word_finder.log', filemode='w', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,7 +15,9 @@ def extract_text_from_image(image_path):
     try:
         logging.info(f"Opening image: {image_path}")
         img = Image.open(image_path)
-        text = pytesseract.image_to_string(img)
+        with metrics.timer('ocr'):
+            text = pytesseract.image_to_string(img)
+        metrics.add_bytes('ocr', os.path.getsize(image_path))
         logging.info("Text extraction successful.")
         return text
     except Exception as e:
@@ -25,7 +28,8 @@ def search_keywords_in_text(text, keywords):
     results = {}
     for keyword in keywords:
         pattern = re.compile(r'([^.]*?'+re.escape(keyword)+r'[^.]*\.)', re.IGNORECASE)
-        matches = pattern.findall(text)
+        with metrics.timer('parse'):
+            matches = pattern.findall(text)
         results[keyword] = matches
         logging.info(f"Keyword '{keyword}' found {len(matches)} times in the text.")
         for match in matches:
@@ -47,9 +51,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Search for keywords in text extracted from an image.")
     parser.add_argument("image_path", help="Path to the image file")
     parser.add_argument("keywords", nargs='+', help="Keywords to search for (multiple keywords allowed)")
+    parser.add_argument("--metrics", metavar="PATH", help="Write timing metrics to PATH (.prom for Prometheus text, otherwise JSON)")
 
+    import argcomplete
     argcomplete.autocomplete(parser)
     args = parser.parse_args()
+    metrics.setup('ocr', args.metrics)
 
     main(args.image_path, args.keywords)
 
@@ -1,17 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import csv
 import logging
 import time
 import readline
+import metrics
+from checkpoint import Checkpoint
 
 # Configure logging
 logging.basicConfig(filename='scraping_log.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+metrics.setup('kev')
 
 # Global Variables
+KEV_CATALOG_URL = "https://www.cisa.gov/known-exploited-vulnerabilities-catalog"
 page = 1
 cves = []
 
+# Progress through the catalog, saved at page boundaries so --resume can pick up from there
+checkpoint = Checkpoint('kev_checkpoint.json')
+
 # Auto-completion and caching functions
 
 def load_cves_from_cache():
@@ -35,8 +41,9 @@ def save_cves_to_cache():
             cache_file.write(cve[0] + '\n')
 
 # Setup readline for auto-completion
-readline.set_completer(complete)
-readline.parse_and_bind("tab: complete")
+def setup_completion():
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
 
 # Function Definitions
 
@@ -52,24 +59,38 @@ def get_user_input():
         print("Invalid input.")
         exit()
 
+def checkpoint_state(year, specific_cves):
+    return {'year': year, 'specific_cves': specific_cves, 'page': page, 'cves': list(cves)}
+
 def scrape_cisa_for_cves(year, specific_cves):
+    """
+    Walks the catalog from the current page. Returns True once the last page has been
+    processed, False if the walk stopped early and the checkpoint should be kept.
+    """
+    # Imported here so cache-only lookups don't pay for the HTTP and HTML stack
+    import httpclient
+    from bs4 import BeautifulSoup
+
     global page
+    frontier = checkpoint_state(year, specific_cves)
     try:
         while True:
-            url = f"https://www.cisa.gov/known-exploited-vulnerabilities-catalog?page={page}"
-            response = requests.get(url)
+            url = f"{KEV_CATALOG_URL}?page={page}"
+            response = httpclient.get(url)
             page += 1
 
             if response.status_code != 200:
                 logging.error(f"Failed to retrieve page {page}. Status code: {response.status_code}")
-                break
+                checkpoint.save(frontier)
+                return False
 
-            soup = BeautifulSoup(response.content, "html.parser")
-            cve_entries = soup.find_all("div", class_="c-view__row")
+            with metrics.timer('parse'):
+                soup = BeautifulSoup(response.content, "html.parser")
+                cve_entries = soup.find_all("div", class_="c-view__row")
 
             if not cve_entries:
                 logging.info("No more CVEs found. Exiting.")
-                break
+                return True
 
             for entry in cve_entries:
                 number_element = entry.find("h3", class_="c-teaser__title")
@@ -85,8 +106,17 @@ def scrape_cisa_for_cves(year, specific_cves):
                     if year == 0 and number not in specific_cves:
                         continue
                     append_cve_data(number, title, summary)
+
+            frontier = checkpoint_state(year, specific_cves)
+            checkpoint.maybe_save(frontier)
     except Exception as e:
         logging.error(f"An error occurred: {str(e)}")
+    except KeyboardInterrupt:
+        logging.info(f"Interrupted, checkpoint saved at page {frontier['page']}")
+        checkpoint.save(frontier)
+        raise
+    checkpoint.save(frontier)
+    return False
 
 def append_cve_data(number, title, summary):
     googleNewsUrl = generate_google_news_url(number)
@@ -101,21 +131,41 @@ def generate_github_search_url(cve):
     return f"https://google.com/search?q=site:github.com+{cve}+exploit+PoC"
 
 def write_data_to_csv():
-    with open('cisa_kevs.csv', mode='w', newline='', encoding='utf-8') as csv_file:
+    with metrics.timer('write'), open('cisa_kevs.csv', mode='w', newline='', encoding='utf-8') as csv_file:
         csv_writer = csv.writer(csv_file)
         csv_writer.writerow(['CVE Number', 'Title', 'Summary', 'Google News Link', 'GitHub Search Link'])
         for cve in cves:
             csv_writer.writerow(cve)
+    metrics.count('rows_total', 'write', len(cves))
     print("Data written to CSV successfully.")
 
 # Main Function
 
-def main():
-    search_year, specific_cves = get_user_input()
-    scrape_cisa_for_cves(search_year, specific_cves)
+def main(resume=False):
+    global page
+    setup_completion()
+    state = checkpoint.load() if resume else None
+    if state:
+        search_year, specific_cves = state['year'], state['specific_cves']
+        page = state['page']
+        cves[:] = state['cves']
+        print(f"Resuming from page {page} with {len(cves)} CVEs already scraped.")
+    else:
+        if resume:
+            print("No checkpoint found, starting a new search.")
+        search_year, specific_cves = get_user_input()
+    completed = scrape_cisa_for_cves(search_year, specific_cves)
     save_cves_to_cache()  # Save scraped CVEs to cache
     write_data_to_csv()
+    if completed:
+        checkpoint.clear()
+    else:
+        print(f"Scrape stopped early; rerun with --resume to continue from {checkpoint.path}.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape the CISA Known Exploited Vulnerabilities catalog.")
+    parser.add_argument("--resume", action="store_true", help="Continue from the last checkpoint instead of starting over")
+    args = parser.parse_args()
+
+    main(args.resume)
 